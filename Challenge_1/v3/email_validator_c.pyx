@@ -0,0 +1,120 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# distutils: extra_compile_args = -O3
+"""
+C implementation of the single-pass email scanner
+Build: cythonize -i email_validator_c.pyx
+The test suite builds it through pyximport when Cython is installed. Only
+portable flags are used, so the build can be shipped to other machines.
+
+email_validator_cli uses this module for its fast path when it has been
+built, and falls back to a single regex match otherwise.
+"""
+
+# Character classes, matching the bits in email_validator_cli
+cdef enum:
+    ALNUM = 1
+    DOT = 2
+    HYPHEN = 4
+    PLUS = 8
+    UNDER = 16
+    AT = 32
+    INVALID = 64
+    DIGIT = 128
+
+cdef unsigned char CLASS[256]
+
+
+cdef void _build_class_table():
+    """Fill the 256-entry byte -> character class lookup table."""
+    cdef int i
+    for i in range(256):
+        CLASS[i] = INVALID
+    for i in range(ord('a'), ord('z') + 1):
+        CLASS[i] = ALNUM
+    for i in range(ord('A'), ord('Z') + 1):
+        CLASS[i] = ALNUM
+    for i in range(ord('0'), ord('9') + 1):
+        CLASS[i] = ALNUM | DIGIT
+    CLASS[ord('.')] = DOT
+    CLASS[ord('-')] = HYPHEN
+    CLASS[ord('+')] = PLUS
+    CLASS[ord('_')] = UNDER
+    CLASS[ord('@')] = AT
+
+
+_build_class_table()
+
+
+cdef bint _scan(const unsigned char *buf, Py_ssize_t length) noexcept nogil:
+    """Same state machine as email_validator_cli._validate_bytes."""
+    cdef Py_ssize_t i
+    cdef Py_ssize_t at = -1
+    cdef Py_ssize_t dots = 0
+    cdef Py_ssize_t label_len = 0
+    cdef unsigned char cls
+    cdef unsigned char prev = 0
+    cdef bint label_alpha = True
+
+    if length > 254:
+        return False
+
+    for i in range(length):
+        cls = CLASS[buf[i]]
+        if cls & INVALID:
+            return False
+        if at < 0:
+            # Local part: alphanumeric runs joined by single . _ + - separators
+            if cls & AT:
+                if not prev & ALNUM or i > 64:
+                    return False
+                at = i
+                prev = 0
+                continue
+            if not cls & ALNUM and not prev & ALNUM:
+                return False
+        elif cls & ALNUM:
+            label_len += 1
+            if cls & DIGIT:
+                label_alpha = False
+        elif cls & HYPHEN:
+            # Hyphens may not start a label; trailing ones are caught at the dot
+            if not label_len:
+                return False
+            label_len += 1
+            label_alpha = False
+        elif cls & DOT:
+            if not prev & ALNUM:
+                return False
+            dots += 1
+            label_len = 0
+            label_alpha = True
+        else:
+            return False
+        if label_len > 63:
+            return False
+        prev = cls
+
+    # The last label is the TLD: letters only, at least 2 characters
+    return at >= 0 and dots > 0 and label_len >= 2 and label_alpha
+
+
+cpdef bint validate_email_c(const unsigned char[::1] buf):
+    """
+    Checks one ASCII-encoded email address.
+
+    The GIL is released during the scan, so a thread pool can validate
+    many addresses in parallel.
+
+    Args:
+        buf (bytes): The email address, encoded as ASCII and already trimmed
+
+    Returns:
+        bool: True if the email is valid
+    """
+    cdef Py_ssize_t length = buf.shape[0]
+    cdef bint result
+    if length == 0:
+        return False
+    with nogil:
+        result = _scan(&buf[0], length)
+    return result
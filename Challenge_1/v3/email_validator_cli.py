@@ -4,9 +4,309 @@ CLI Email Validation Tool
 Usage: python email_validator.py <email_address>
 """
 
+import enum
+import functools
+import os
 import re
+import string
 import sys
 
+try:
+    import hyperscan
+except ImportError:
+    # validate_emails_stream falls back to the scalar fast path
+    hyperscan = None
+
+try:
+    from email_validator_c import validate_email_c
+except ImportError:
+    # Extension not built (cythonize -i email_validator_c.pyx); use _EMAIL_RE
+    validate_email_c = None
+
+try:
+    import re2
+except ImportError:
+    # Regexes are compiled with the standard re module instead
+    re2 = None
+
+# RE2 is opt-in (EMAIL_VALIDATOR_RE2=1). It only covers _LOCAL_RE and
+# _DOMAIN_RE, which see at most 254 bytes that already passed the translate
+# filters, so its linear-time guarantee buys nothing here and each match costs
+# about 3x what re does.
+_USE_RE2 = re2 is not None and os.environ.get('EMAIL_VALIDATOR_RE2', '0') == '1'
+
+
+def _compile_regex(pattern):
+    """Compiles a pattern with RE2 when enabled, falling back to re."""
+    if _USE_RE2:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# Result codes as plain ints, used on the hot path. On 3.11 an IntEnum member
+# lookup costs more than the tuple allocation the codes were meant to save.
+_OK = 0
+_EMPTY = 1
+_TOO_LONG = 2
+_BAD_AT_COUNT = 3
+_LOCAL_LENGTH = 4
+_LOCAL_FORMAT = 5
+_LOCAL_CONSECUTIVE_DOTS = 6
+_DOMAIN_TOO_SHORT = 7
+_DOMAIN_FORMAT = 8
+_LABEL_TOO_LONG = 9
+_TLD_TOO_SHORT = 10
+_NON_ASCII = 11
+_DOMAIN_NOT_ALLOWED = 12
+
+
+class ValidationError(enum.IntEnum):
+    """
+    Result codes for email validation; OK means the email is valid.
+    
+    Names the plain int codes above. _validate_core returns those ints, not
+    members; pass one to ValidationError() to get the member.
+    """
+    OK = _OK
+    EMPTY = _EMPTY
+    TOO_LONG = _TOO_LONG
+    BAD_AT_COUNT = _BAD_AT_COUNT
+    LOCAL_LENGTH = _LOCAL_LENGTH
+    LOCAL_FORMAT = _LOCAL_FORMAT
+    LOCAL_CONSECUTIVE_DOTS = _LOCAL_CONSECUTIVE_DOTS
+    DOMAIN_TOO_SHORT = _DOMAIN_TOO_SHORT
+    DOMAIN_FORMAT = _DOMAIN_FORMAT
+    LABEL_TOO_LONG = _LABEL_TOO_LONG
+    TLD_TOO_SHORT = _TLD_TOO_SHORT
+    NON_ASCII = _NON_ASCII
+    DOMAIN_NOT_ALLOWED = _DOMAIN_NOT_ALLOWED
+
+
+# Messages indexed by ValidationError code
+_MESSAGES = (
+    "Valid email address",
+    "Email cannot be empty",
+    "Email exceeds maximum length of 254 characters",
+    "Email must contain exactly one @ symbol",
+    "Local part must be 1-64 characters",
+    "Local part contains invalid characters or format",
+    "Local part cannot contain consecutive dots",
+    "Domain part is too short",
+    "Domain contains invalid characters or format",
+    "Domain label exceeds 63 characters",
+    "Top-level domain must be at least 2 characters",
+    "Email contains non-ASCII characters",
+    "Domain is not in the list of allowed domains",
+)
+
+# validate_email return values, prebuilt and indexed by ValidationError code
+_RESULTS = ((True, _MESSAGES[0]),) + tuple((False, message) for message in _MESSAGES[1:])
+
+# Local part pattern: allows alphanumeric, dots, plus signs, hyphens, underscores
+# Must not start or end with a dot, no consecutive dots
+# Patterns and character sets are bytes: the core works on the ASCII encoding
+_LOCAL_RE = _compile_regex(rb'^[a-zA-Z0-9]+([._+-][a-zA-Z0-9]+)*$')
+
+# Domain can contain subdomains
+# Pattern: alphanumeric and hyphens, separated by dots
+# Must end with valid TLD (2+ characters)
+_DOMAIN_RE = _compile_regex(rb'^([a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$')
+
+# Allowed characters, used to reject obviously bad input before the regexes run
+_ALNUM_CHARS = (string.ascii_letters + string.digits).encode('ascii')
+_LOCAL_SEPARATORS = b'._+-'
+# Every byte NOT allowed, for bytes.translate(None, delete) filtering in C
+_LOCAL_BAD = bytes(i for i in range(256) if i not in _ALNUM_CHARS + _LOCAL_SEPARATORS)
+_DOMAIN_BAD = bytes(i for i in range(256) if i not in _ALNUM_CHARS + b'.-')
+_EMAIL_BAD = bytes(i for i in range(256) if i not in _ALNUM_CHARS + _LOCAL_SEPARATORS + b'@')
+
+# Whole-address pattern, used for the fast path and by Hyperscan. The TLD is
+# capped at 63 characters to match the per-label limit; total and local part
+# length are checked separately.
+_EMAIL_PATTERN = (
+    rb'^[a-zA-Z0-9]+(?:[._+-][a-zA-Z0-9]+)*'
+    rb'@(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,63}$'
+)
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+# Character classes for the single-pass scanner, one bit per class. The
+# scanner is only worth running compiled (Numba, email_validator_c); in the
+# interpreter _EMAIL_RE is several times faster.
+# Digits carry both _ALNUM and _DIGIT so the TLD can be checked for letters only.
+_ALNUM = 1
+_DOT = 2
+_HYPHEN = 4
+_PLUS = 8
+_UNDER = 16
+_AT = 32
+_INVALID = 64
+_DIGIT = 128
+
+
+def _build_class_table():
+    """Build the 256-entry byte -> character class lookup table."""
+    table = bytearray([_INVALID]) * 256
+    for char in string.ascii_letters:
+        table[ord(char)] = _ALNUM
+    for char in string.digits:
+        table[ord(char)] = _ALNUM | _DIGIT
+    table[ord('.')] = _DOT
+    table[ord('-')] = _HYPHEN
+    table[ord('+')] = _PLUS
+    table[ord('_')] = _UNDER
+    table[ord('@')] = _AT
+    return bytes(table)
+
+
+_CLASS = _build_class_table()
+
+
+def _validate_bytes(buf, start, end, table):
+    """
+    Checks one ASCII-encoded email in one pass, without the regex engine.
+    
+    Accepts exactly the addresses validate_email accepts, but only reports
+    whether the address is valid, not why it is invalid. Written so that
+    Numba can compile it unchanged for validate_email_batch.
+    
+    Args:
+        buf: Bytes-like buffer holding the encoded email
+        start (int): Offset of the first byte of the email in buf
+        end (int): Offset just past the last byte of the email in buf
+        table: The _CLASS lookup table (or a uint8 array copy of it)
+        
+    Returns:
+        bool: True if the email is valid
+    """
+    if end - start > 254:
+        return False
+    
+    at = -1
+    prev = 0
+    dots = 0
+    label_len = 0
+    label_alpha = True
+    for i in range(start, end):
+        cls = table[buf[i]]
+        if cls & _INVALID:
+            return False
+        if at < 0:
+            # Local part: alphanumeric runs joined by single . _ + - separators
+            if cls & _AT:
+                if not prev & _ALNUM or i - start > 64:
+                    return False
+                at = i
+                prev = 0
+                continue
+            if not cls & _ALNUM and not prev & _ALNUM:
+                return False
+        elif cls & _ALNUM:
+            label_len += 1
+            if cls & _DIGIT:
+                label_alpha = False
+        elif cls & _HYPHEN:
+            # Hyphens may not start a label; trailing ones are caught at the dot
+            if not label_len:
+                return False
+            label_len += 1
+            label_alpha = False
+        elif cls & _DOT:
+            if not prev & _ALNUM:
+                return False
+            dots += 1
+            label_len = 0
+            label_alpha = True
+        else:
+            return False
+        if label_len > 63:
+            return False
+        prev = cls
+    
+    # The last label is the TLD: letters only, at least 2 characters
+    return at >= 0 and dots > 0 and label_len >= 2 and label_alpha
+
+
+# NumPy and Numba are imported by _load_numba on the first batch call: the
+# numba import alone takes about 0.23 s, more than a whole single-address CLI
+# run. Until then these stay None and scalar calls use the other paths.
+np = None
+prange = range
+_CLASS_ARRAY = None
+_validate_bytes_jit = None
+_validate_batch_kernel = None
+
+
+def _batch_kernel(buf, offsets, table):
+    """Runs _validate_bytes over every row of a packed buffer in parallel."""
+    count = len(offsets) - 1
+    mask = np.empty(count, dtype=np.bool_)
+    for row in prange(count):
+        mask[row] = _validate_bytes_jit(buf, offsets[row], offsets[row + 1], table)
+    return mask
+
+
+@functools.lru_cache(maxsize=None)
+def _load_numba():
+    """
+    Imports NumPy and Numba and compiles the batch kernels, once.
+    
+    Returns:
+        bool: True if the kernels are available, False if either package is missing
+    """
+    global np, prange, _CLASS_ARRAY, _validate_bytes_jit, _validate_batch_kernel
+    try:
+        import numpy
+        import numba
+    except ImportError:
+        # validate_email_batch falls back to a scalar Python loop
+        return False
+    
+    np = numpy
+    prange = numba.prange
+    _CLASS_ARRAY = np.frombuffer(_CLASS, dtype=np.uint8)
+    _validate_bytes_jit = numba.njit(cache=True)(_validate_bytes)
+    _validate_batch_kernel = numba.njit(parallel=True, cache=True)(_batch_kernel)
+    return True
+
+
+if hyperscan is not None:
+    _HS_DB = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    _HS_DB.compile(expressions=[_EMAIL_PATTERN], ids=[0], flags=[0])
+
+
+def _on_hs_match(pattern_id, start, end, flags, context):
+    """Hyperscan match callback; context is [input length, matched]."""
+    # $ also matches before a trailing newline, so require the full input
+    if end == context[0]:
+        context[1] = True
+
+
+def _is_valid_bytes(data):
+    """
+    Checks one trimmed, ASCII-encoded email with the fastest scalar path.
+    
+    Prefers the compiled state machine: the C scanner when the extension is
+    built, then the Numba-compiled _validate_bytes once a batch call has
+    loaded it, and a single _EMAIL_RE match otherwise.
+    
+    Args:
+        data (bytes): The email address, encoded as ASCII
+        
+    Returns:
+        bool: True if the email is valid
+    """
+    if validate_email_c is not None:
+        return validate_email_c(data)
+    if _validate_bytes_jit is not None:
+        return _validate_bytes_jit(data, 0, len(data), _CLASS_ARRAY)
+    # fullmatch, because $ would also accept a trailing newline
+    return (len(data) <= 254
+            and 0 < data.find(b'@') <= 64
+            and _EMAIL_RE.fullmatch(data) is not None)
+
 
 def validate_email(email):
     """
@@ -18,64 +318,288 @@ def validate_email(email):
     Returns:
         tuple: (is_valid, error_message)
     """
-    if not email or not isinstance(email, str):
-        return False, "Email cannot be empty"
+    if not isinstance(email, str):
+        return _RESULTS[_EMPTY]
+    
+    return validate_email_str(email)
+
+
+def validate_email_str(email):
+    """
+    Validates an email address known to be a str; see validate_email.
     
+    Skips the isinstance check, for callers such as pipelines that
+    already guarantee str input.
+    
+    Args:
+        email (str): The email address to validate
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    if not email:
+        return _RESULTS[_EMPTY]
+    
+    # strip() hands back the same object when there is nothing to trim,
+    # so clean input costs no allocation and no boundary check is needed
     email = email.strip()
     
-    # Check overall length (RFC 5321: max 254 characters)
+    # Reject oversized input before it can become a cache key
     if len(email) > 254:
-        return False, "Email exceeds maximum length of 254 characters"
+        return _RESULTS[_TOO_LONG]
+    
+    return _RESULTS[_validate_core(email)]
+
+
+# The validator is pure, so repeated addresses are served from this cache.
+# Callers reject keys over 254 characters first, which bounds its size: each
+# entry is about 95 bytes of cache bookkeeping plus the key string (about 70
+# bytes for a typical address, at most about 300). A full cache is about
+# 17 MB for typical addresses and about 40 MB in the worst case. A miss costs
+# roughly 0.3-0.5 us more than an uncached call, so unique-heavy workloads pay
+# for the cache rather than benefit from it.
+@functools.lru_cache(maxsize=100_000)
+def _validate_core(email):
+    """
+    Validates an already trimmed email address; see validate_email.
+    
+    Returns a ValidationError code rather than a message, so bulk callers
+    that only need the verdict skip building the result tuple.
+    
+    Args:
+        email (str): The trimmed email address to validate
+        
+    Returns:
+        int: A ValidationError code; 0 (OK) if valid
+    """
+    # The grammar is pure ASCII, so everything below works on bytes
+    try:
+        data = email.encode('ascii')
+    except UnicodeEncodeError:
+        return _NON_ASCII
+    
+    # Check overall length (RFC 5321: max 254 characters). validate_email_str
+    # rejects longer input before calling here, so this only catches the
+    # 'user@' + domain probe in make_validator.
+    if len(data) > 254:
+        return _TOO_LONG
     
     # Check for exactly one @ symbol
-    if email.count('@') != 1:
-        return False, "Email must contain exactly one @ symbol"
+    at = data.find(b'@')
+    if at < 0 or at != data.rfind(b'@'):
+        return _BAD_AT_COUNT
+    
+    # Consecutive dots in a local part of valid length can only be reported
+    # as a format error, so answer that without the scan or the regexes
+    dots = data.find(b'..')
+    if 0 <= dots < at <= 64:
+        return _LOCAL_FORMAT
+    
+    # Fast path: valid addresses are accepted after a single match. The
+    # checks above, the O(1) boundary checks and the character filter run
+    # first, so structurally bad input never pays for the fast path scan.
+    # Anything else falls through to the checks below for a specific error.
+    last = len(data) - 1
+    if (dots < 0
+            and 0 < at < last
+            and data[0] not in _LOCAL_SEPARATORS
+            and data[at - 1] not in _LOCAL_SEPARATORS
+            and data[at + 1] not in b'.-'
+            and data[last] not in b'.-'
+            and len(data.translate(None, _EMAIL_BAD)) == len(data)
+            and _is_valid_bytes(data)):
+        return _OK
     
     # Split into local and domain parts
-    try:
-        local, domain = email.rsplit('@', 1)
-    except ValueError:
-        return False, "Invalid email format"
+    local = data[:at]
+    domain = data[at + 1:]
     
     # Validate local part (before @)
+    code = _check_local(local)
+    if code:
+        return code
+    
+    # Validate domain part (after @)
+    if not domain or len(domain) < 3:
+        return _DOMAIN_TOO_SHORT
+    
+    if (len(domain.translate(None, _DOMAIN_BAD)) != len(domain)
+            or domain[0] in b'.-'
+            or domain[-1] in b'.-'
+            or not _DOMAIN_RE.match(domain)):
+        return _DOMAIN_FORMAT
+    
+    # Check each domain label length (max 63 characters per label).
+    # _DOMAIN_RE already bounds every label except the TLD and keeps hyphens
+    # off label boundaries, so only the TLD is left to check.
+    tld_len = len(domain) - domain.rfind(b'.') - 1
+    if tld_len > 63:
+        return _LABEL_TOO_LONG
+    
+    # Check TLD is at least 2 characters
+    if tld_len < 2:
+        return _TLD_TOO_SHORT
+    
+    return _OK
+
+
+def _check_local(local):
+    """
+    Validates the local part (before @) of an ASCII-encoded email.
+    
+    Args:
+        local (bytes): The local part
+        
+    Returns:
+        int: A ValidationError code; 0 (OK) if valid
+    """
     if not local or len(local) > 64:
-        return False, "Local part must be 1-64 characters"
+        return _LOCAL_LENGTH
     
-    # Local part pattern: allows alphanumeric, dots, plus signs, hyphens, underscores
-    # Must not start or end with a dot, no consecutive dots
-    local_pattern = r'^[a-zA-Z0-9]+([._+-][a-zA-Z0-9]+)*$'
-    if not re.match(local_pattern, local):
-        return False, "Local part contains invalid characters or format"
+    # Cheap character and boundary checks before entering the regex engine
+    if (len(local.translate(None, _LOCAL_BAD)) != len(local)
+            or local[0] in _LOCAL_SEPARATORS
+            or local[-1] in _LOCAL_SEPARATORS
+            or not _LOCAL_RE.match(local)):
+        return _LOCAL_FORMAT
     
     # Check for consecutive dots
-    if '..' in local:
-        return False, "Local part cannot contain consecutive dots"
+    if b'..' in local:
+        return _LOCAL_CONSECUTIVE_DOTS
     
-    # Validate domain part (after @)
-    if not domain or len(domain) < 3:
-        return False, "Domain part is too short"
-    
-    # Domain can contain subdomains
-    # Pattern: alphanumeric and hyphens, separated by dots
-    # Must end with valid TLD (2+ characters)
-    domain_pattern = r'^([a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$'
-    if not re.match(domain_pattern, domain):
-        return False, "Domain contains invalid characters or format"
-    
-    # Check each domain label length (max 63 characters per label)
-    labels = domain.split('.')
-    for label in labels:
-        if len(label) > 63:
-            return False, "Domain label exceeds 63 characters"
-        if label.startswith('-') or label.endswith('-'):
-            return False, "Domain labels cannot start or end with hyphen"
+    return _OK
+
+
+# Source for make_validator. It repeats the checks of validate_email_str and
+# _validate_core up to the domain, in the same order; a test pins the two
+# together. Results are written out as tuple literals and the allowed domains
+# as a set literal, which Python compiles to constants (a frozenset for `in`).
+_VALIDATOR_TEMPLATE = """
+def validate_email(email):
+    if not email or not isinstance(email, str):
+        return {empty!r}
+    email = email.strip()
+    if len(email) > 254:
+        return {too_long!r}
+    try:
+        data = email.encode('ascii')
+    except UnicodeEncodeError:
+        return {non_ascii!r}
+    at = data.find(b'@')
+    if at < 0 or at != data.rfind(b'@'):
+        return {bad_at_count!r}
+    code = _check_local(data[:at])
+    if code:
+        return _RESULTS[code]
+    if data[at + 1:].lower() not in {domains}:
+        return {not_allowed!r}
+    return {ok!r}
+"""
+
+
+def make_validator(allowed_domains=None):
+    """
+    Builds a validate_email variant specialized for a fixed set of domains.
     
-    # Check TLD is at least 2 characters
-    tld = labels[-1]
-    if len(tld) < 2:
-        return False, "Top-level domain must be at least 2 characters"
+    With allowed_domains, the returned function checks the local part as
+    usual but replaces the domain checks with a case-insensitive lookup in
+    the allowed set. The function is generated at runtime so that the set
+    and messages are constants in its bytecode.
+    
+    Args:
+        allowed_domains (iterable): Domains to accept, or None for any valid domain
+        
+    Returns:
+        callable: A function with the same signature and results as validate_email
+    """
+    if allowed_domains is None:
+        return validate_email
+    if isinstance(allowed_domains, str):
+        raise TypeError("allowed_domains must be a collection of domains, not a str")
+    
+    domains = set()
+    for domain in allowed_domains:
+        if _validate_core('user@' + domain) != _OK:
+            raise ValueError(f"Invalid allowed domain: {domain!r}")
+        domains.add(domain.lower().encode('ascii'))
+    
+    source = _VALIDATOR_TEMPLATE.format(
+        empty=_RESULTS[_EMPTY],
+        too_long=_RESULTS[_TOO_LONG],
+        non_ascii=_RESULTS[_NON_ASCII],
+        bad_at_count=_RESULTS[_BAD_AT_COUNT],
+        not_allowed=_RESULTS[_DOMAIN_NOT_ALLOWED],
+        ok=_RESULTS[_OK],
+        # An empty set literal would be a dict, so use an empty tuple instead
+        domains='{' + ', '.join(map(repr, sorted(domains))) + '}' if domains else '()',
+    )
+    namespace = {'_check_local': _check_local, '_RESULTS': _RESULTS}
+    exec(compile(source, '<make_validator>', 'exec'), namespace)
+    return namespace['validate_email']
+
+
+def _encode_trimmed(email):
+    """
+    Prepares one input for the bulk validators, trimmed and ASCII-encoded.
+    
+    Non-ASCII characters become '?' and non-str input becomes b'', so both
+    are reported invalid like validate_email does.
+    """
+    if not isinstance(email, str):
+        return b''
+    return email.strip().encode('ascii', errors='replace')
+
+
+def validate_email_batch(emails):
+    """
+    Validates many email addresses at once.
+    
+    Uses a parallel Numba kernel over one packed byte buffer when NumPy and
+    Numba are installed, and a plain Python loop otherwise.
+    
+    Args:
+        emails (list): The email addresses to validate
+        
+    Returns:
+        numpy.ndarray or list: One boolean per email, True if valid
+    """
+    encoded = [_encode_trimmed(email) for email in emails]
+    
+    if not _load_numba():
+        return [_is_valid_bytes(data) for data in encoded]
+    
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return _validate_batch_kernel(buf, offsets, _CLASS_ARRAY)
+
+
+def validate_emails_stream(emails):
+    """
+    Validates a stream of email addresses with a Hyperscan DFA.
+    
+    Takes the same input as validate_email_batch, and falls back to the
+    scalar fast path when Hyperscan is not installed.
+    
+    Args:
+        emails (iterable): The email addresses to validate
+        
+    Yields:
+        bool: True for each valid email, in input order
+    """
+    if hyperscan is None:
+        for email in emails:
+            yield _is_valid_bytes(_encode_trimmed(email))
+        return
     
-    return True, "Valid email address"
+    for email in emails:
+        data = _encode_trimmed(email)
+        if len(data) > 254:
+            yield False
+            continue
+        context = [len(data), False]
+        _HS_DB.scan(data, match_event_handler=_on_hs_match, context=context)
+        yield context[1] and data.find(b'@') <= 64
 
 
 def main():
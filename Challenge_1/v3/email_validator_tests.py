@@ -5,130 +5,194 @@ Usage: python test_email_validator.py
 """
 
 import unittest
-from email_validator_cli import validate_email
+from unittest import mock
+
+try:
+    import pyximport
+except ImportError:
+    # No Cython: the C extension test is skipped unless it was built by hand
+    pass
+else:
+    # Builds email_validator_c on import, outside the source tree (~/.pyxbld)
+    pyximport.install(language_level=3)
+
+import email_validator_cli
+from email_validator_cli import (
+    _CLASS,
+    _is_valid_bytes,
+    _validate_bytes,
+    make_validator,
+    validate_email,
+    validate_email_batch,
+    validate_email_str,
+    validate_emails_stream,
+    validate_email_c,
+)
+
+
+VALID_SIMPLE_EMAILS = [
+    "user@example.com",
+    "test@domain.co.uk",
+    "admin@subdomain.example.com",
+    "john.doe@company.org",
+    "a@b.co",
+]
+
+VALID_PLUS_ADDRESSING = [
+    "user+tag@example.com",
+    "name+filter@domain.org",
+    "admin+test+multiple@site.com",
+]
+
+VALID_SPECIAL_CHARACTERS = [
+    "user_name@example.com",
+    "first-last@domain.com",
+    "user.name@example.com",
+    "user_name-123@test.org",
+]
+
+VALID_SUBDOMAINS = [
+    "user@mail.company.com",
+    "admin@deep.sub.domain.example.org",
+    "test@a.b.c.d.com",
+]
+
+INVALID_MISSING_PARTS = [
+    "",
+    "@example.com",
+    "user@",
+    "userexample.com",
+    "@",
+]
+
+INVALID_MULTIPLE_AT_SYMBOLS = [
+    "user@@example.com",
+    "user@domain@example.com",
+    "@@example.com",
+]
+
+INVALID_LOCAL_PART = [
+    ".user@example.com",  # starts with dot
+    "user.@example.com",  # ends with dot
+    "user..name@example.com",  # consecutive dots
+    "user@name@example.com",  # @ in local part
+    "user name@example.com",  # space
+    "user#name@example.com",  # invalid character
+    "user\n@example.com",  # embedded newline
+    "usér@example.com",  # non-ASCII character
+]
+
+INVALID_DOMAIN_PART = [
+    "user@.example.com",  # starts with dot
+    "user@example.com.",  # ends with dot
+    "user@example..com",  # consecutive dots
+    "user@example",  # no TLD
+    "user@.com",  # missing domain
+    "user@domain-.com",  # hyphen at end
+    "user@-domain.com",  # hyphen at start
+]
+
+INVALID_TLD = [
+    "user@example.c",  # TLD too short
+    "user@example.123",  # numeric TLD
+]
+
+VALID_REAL_WORLD = [
+    "support@github.com",
+    "noreply@google.com",
+    "hello+spam@stripe.com",
+    "admin@mail.company.co.uk",
+    "user_123@test-domain.org",
+]
+
+# Encoded inputs on the length limits, with the expected verdict, for
+# checking each fast path against the Python state machine
+_BOUNDARY_LABELS = b"b" * 63 + b"." + b"c" * 63 + b"." + b"d" * 63 + b"."
+SCANNER_BOUNDARY_CASES = [
+    (b"", False),
+    (b"user@example.com", True),
+    (b"a" * 64 + b"@example.com", True),  # local part of 64
+    (b"a" * 65 + b"@example.com", False),  # local part of 65
+    (b"a@" + _BOUNDARY_LABELS + b"e" * 60, True),  # total of 254
+    (b"a@" + _BOUNDARY_LABELS + b"e" * 61, False),  # total of 255
+    (b"user@example." + b"c" * 63, True),  # TLD of 63
+    (b"user@example." + b"c" * 64, False),  # TLD of 64
+    (b"user@example.123", False),
+    (b"user@domain-.com", False),
+    (b"user..name@example.com", False),
+    (b"user@example.com\n", False),
+]
 
 
 class TestEmailValidation(unittest.TestCase):
     """Comprehensive test cases for email validation."""
     
+    def assert_all_valid(self, emails):
+        """Validate emails in one batch and report any that are rejected."""
+        mask = validate_email_batch(emails)
+        rejected = [email for email, is_valid in zip(emails, mask) if not is_valid]
+        self.assertEqual(rejected, [], "emails should be valid")
+    
+    def assert_all_invalid(self, emails):
+        """Validate emails in one batch and report any that are accepted."""
+        mask = validate_email_batch(emails)
+        accepted = [email for email, is_valid in zip(emails, mask) if is_valid]
+        self.assertEqual(accepted, [], "emails should be invalid")
+    
     def test_valid_simple_emails(self):
         """Test simple valid email addresses."""
-        valid_emails = [
-            "user@example.com",
-            "test@domain.co.uk",
-            "admin@subdomain.example.com",
-            "john.doe@company.org",
-            "a@b.co",
-        ]
-        for email in valid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertTrue(is_valid, f"{email} should be valid")
+        self.assert_all_valid(VALID_SIMPLE_EMAILS)
     
     def test_valid_plus_addressing(self):
         """Test plus addressing (email aliases)."""
-        valid_emails = [
-            "user+tag@example.com",
-            "name+filter@domain.org",
-            "admin+test+multiple@site.com",
-        ]
-        for email in valid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertTrue(is_valid, f"{email} should be valid")
+        self.assert_all_valid(VALID_PLUS_ADDRESSING)
     
     def test_valid_special_characters(self):
         """Test valid special characters in local part."""
-        valid_emails = [
-            "user_name@example.com",
-            "first-last@domain.com",
-            "user.name@example.com",
-            "user_name-123@test.org",
-        ]
-        for email in valid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertTrue(is_valid, f"{email} should be valid")
+        self.assert_all_valid(VALID_SPECIAL_CHARACTERS)
     
     def test_valid_subdomains(self):
         """Test emails with multiple subdomains."""
-        valid_emails = [
-            "user@mail.company.com",
-            "admin@deep.sub.domain.example.org",
-            "test@a.b.c.d.com",
-        ]
-        for email in valid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertTrue(is_valid, f"{email} should be valid")
+        self.assert_all_valid(VALID_SUBDOMAINS)
     
     def test_invalid_missing_parts(self):
         """Test emails missing required parts."""
-        invalid_emails = [
-            "",
-            "@example.com",
-            "user@",
-            "userexample.com",
-            "@",
-        ]
-        for email in invalid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertFalse(is_valid, f"{email} should be invalid")
+        self.assert_all_invalid(INVALID_MISSING_PARTS)
     
     def test_invalid_multiple_at_symbols(self):
         """Test emails with multiple @ symbols."""
-        invalid_emails = [
-            "user@@example.com",
-            "user@domain@example.com",
-            "@@example.com",
-        ]
-        for email in invalid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertFalse(is_valid, f"{email} should be invalid")
+        self.assert_all_invalid(INVALID_MULTIPLE_AT_SYMBOLS)
     
     def test_invalid_local_part(self):
         """Test invalid local part formats."""
-        invalid_emails = [
-            ".user@example.com",  # starts with dot
-            "user.@example.com",  # ends with dot
-            "user..name@example.com",  # consecutive dots
-            "user@name@example.com",  # @ in local part
-            "user name@example.com",  # space
-            "user#name@example.com",  # invalid character
-        ]
-        for email in invalid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertFalse(is_valid, f"{email} should be invalid")
+        self.assert_all_invalid(INVALID_LOCAL_PART)
     
     def test_invalid_domain_part(self):
         """Test invalid domain formats."""
-        invalid_emails = [
-            "user@.example.com",  # starts with dot
-            "user@example.com.",  # ends with dot
-            "user@example..com",  # consecutive dots
-            "user@example",  # no TLD
-            "user@.com",  # missing domain
-            "user@domain-.com",  # hyphen at end
-            "user@-domain.com",  # hyphen at start
-        ]
-        for email in invalid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertFalse(is_valid, f"{email} should be invalid")
+        self.assert_all_invalid(INVALID_DOMAIN_PART)
     
     def test_invalid_tld(self):
         """Test invalid top-level domains."""
-        invalid_emails = [
-            "user@example.c",  # TLD too short
-            "user@example.123",  # numeric TLD
-        ]
-        for email in invalid_emails:
-            with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
-                self.assertFalse(is_valid, f"{email} should be invalid")
+        self.assert_all_invalid(INVALID_TLD)
+    
+    def test_single_email_diagnostics(self):
+        """Test each example email on its own, to localize failures."""
+        for emails, expected in [
+            (VALID_SIMPLE_EMAILS, True),
+            (VALID_PLUS_ADDRESSING, True),
+            (VALID_SPECIAL_CHARACTERS, True),
+            (VALID_SUBDOMAINS, True),
+            (VALID_REAL_WORLD, True),
+            (INVALID_MISSING_PARTS, False),
+            (INVALID_MULTIPLE_AT_SYMBOLS, False),
+            (INVALID_LOCAL_PART, False),
+            (INVALID_DOMAIN_PART, False),
+            (INVALID_TLD, False),
+        ]:
+            for email in emails:
+                with self.subTest(email=email):
+                    is_valid, _ = validate_email(email)
+                    self.assertEqual(is_valid, expected)
     
     def test_length_constraints(self):
         """Test email length constraints."""
@@ -142,6 +206,12 @@ class TestEmailValidation(unittest.TestCase):
         long_email = "user@" + "a" * 250 + ".com"
         is_valid, msg = validate_email(long_email)
         self.assertFalse(is_valid)
+        self.assertIn("254", msg)
+        
+        # Oversized input is rejected before it reaches the result cache
+        is_valid, msg = validate_email("é" * 100_000)
+        self.assertFalse(is_valid)
+        self.assertIn("254", msg)
         
         # Domain label too long (>63 chars)
         long_label = "user@" + "a" * 64 + ".com"
@@ -172,17 +242,125 @@ class TestEmailValidation(unittest.TestCase):
     
     def test_real_world_examples(self):
         """Test real-world email patterns."""
-        valid_emails = [
-            "support@github.com",
-            "noreply@google.com",
-            "hello+spam@stripe.com",
-            "admin@mail.company.co.uk",
-            "user_123@test-domain.org",
+        self.assert_all_valid(VALID_REAL_WORLD)
+    
+    def test_batch_matches_single(self):
+        """Test batch validation agrees with single-email validation."""
+        emails = [
+            "user@example.com",
+            "  user@example.com  ",
+            "user+tag@mail.company.co.uk",
+            "user..name@example.com",
+            "user@domain-.com",
+            "user@example.123",
+            "a" * 65 + "@example.com",
+            "user@" + "a" * 64 + ".com",
+            "",
+            None,
+        ]
+        mask = validate_email_batch(emails)
+        self.assertEqual(len(mask), len(emails))
+        for email, is_valid in zip(emails, mask):
+            with self.subTest(email=email):
+                self.assertEqual(bool(is_valid), validate_email(email)[0])
+        
+        self.assertEqual(len(validate_email_batch([])), 0)
+    
+    def test_stream_matches_single(self):
+        """Test stream validation agrees with single-email validation."""
+        emails = [
+            "user@example.com",
+            "admin+test@deep.sub.domain.example.org",
+            "user@example",
+            "user@example.com.",
+            "a" * 64 + "@example.com",
+            "a" * 65 + "@example.com",
+            "user@" + "a" * 250 + ".com",
+            "  user@example.com\n",
+            "usér@example.com",
+            "",
+            None,
         ]
-        for email in valid_emails:
+        results = list(validate_emails_stream(iter(emails)))
+        self.assertEqual(results, [bool(is_valid) for is_valid in validate_email_batch(emails)])
+        for email, is_valid in zip(emails, results):
+            with self.subTest(email=email):
+                self.assertEqual(is_valid, validate_email(email)[0])
+    
+    @unittest.skipUnless(validate_email_c, "C extension not built")
+    def test_c_extension_matches_python_scanner(self):
+        """Test the C scanner agrees with the Python state machine."""
+        for data, expected in SCANNER_BOUNDARY_CASES:
+            with self.subTest(data=data):
+                self.assertEqual(bool(validate_email_c(data)), expected)
+                self.assertEqual(bool(_validate_bytes(data, 0, len(data), _CLASS)), expected)
+    
+    def test_regex_fallback_matches_python_scanner(self):
+        """Test the _EMAIL_RE fast path agrees with the Python state machine."""
+        self.assertEqual(len(SCANNER_BOUNDARY_CASES[4][0]), 254)
+        
+        # Without the C extension or a loaded Numba kernel, _is_valid_bytes
+        # falls back to a single _EMAIL_RE match
+        with mock.patch.object(email_validator_cli, "validate_email_c", None), \
+                mock.patch.object(email_validator_cli, "_validate_bytes_jit", None):
+            for data, expected in SCANNER_BOUNDARY_CASES:
+                with self.subTest(data=data):
+                    self.assertEqual(_is_valid_bytes(data), expected)
+                    self.assertEqual(_validate_bytes(data, 0, len(data), _CLASS), expected)
+    
+    def test_str_fast_path_matches_single(self):
+        """Test the str-only entry point on its own."""
+        cases = [
+            ("user@example.com", (True, "Valid email address")),
+            ("  user@example.com  ", (True, "Valid email address")),
+            ("", (False, "Email cannot be empty")),
+            ("   ", (False, "Email must contain exactly one @ symbol")),
+            ("user@" + "a" * 250 + ".com", (False, "Email exceeds maximum length of 254 characters")),
+            ("usér@example.com", (False, "Email contains non-ASCII characters")),
+            ("user@@example.com", (False, "Email must contain exactly one @ symbol")),
+            (".user@example.com", (False, "Local part contains invalid characters or format")),
+            ("user@example", (False, "Domain contains invalid characters or format")),
+        ]
+        for email, expected in cases:
+            with self.subTest(email=email):
+                self.assertEqual(validate_email_str(email), expected)
+                self.assertEqual(validate_email(email), expected)
+    
+    def test_make_validator_allowed_domains(self):
+        """Test validators restricted to a set of allowed domains."""
+        validate = make_validator({"example.com", "Corp.Example.org"})
+        
+        for email in ["user@example.com", "first.last@EXAMPLE.com", "  a+b@corp.example.org  "]:
             with self.subTest(email=email):
-                is_valid, _ = validate_email(email)
+                is_valid, _ = validate(email)
                 self.assertTrue(is_valid, f"{email} should be valid")
+        
+        for email in ["user@other.com", "user@sub.example.com", ".user@example.com", "user@@example.com", None]:
+            with self.subTest(email=email):
+                is_valid, _ = validate(email)
+                self.assertFalse(is_valid, f"{email} should be invalid")
+        
+        is_valid, msg = validate("user@other.com")
+        self.assertIn("allowed", msg)
+        
+        self.assertIs(make_validator(), validate_email)
+        with self.assertRaises(ValueError):
+            make_validator(["-example.com"])
+        with self.assertRaises(TypeError):
+            make_validator("example.com")
+    
+    def test_make_validator_matches_single(self):
+        """Test the generated validator matches validate_email up to the domain check."""
+        validate = make_validator(["example.com"])
+        emails = (
+            [None, "", "   ", "é" * 300, "user@" + "a" * 250 + ".com", "usér@example.com"]
+            + ["@example.com", "userexample.com", "@"] + INVALID_MULTIPLE_AT_SYMBOLS
+            + [email for email in INVALID_LOCAL_PART if email.endswith("@example.com")]
+            + ["a" * 64 + "@example.com", "a" * 65 + "@example.com", "  user@example.com  "]
+        )
+        for email in emails:
+            with self.subTest(email=email):
+                self.assertEqual(validate(email), validate_email(email))
 
 
 def run_tests():